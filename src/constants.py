@@ -0,0 +1,55 @@
+"""PhotoFlow Master - Constantes partagées entre les modules."""
+
+# Extensions d'images reconnues pour la détection de date EXIF.
+ALL_SUPPORTED_FORMATS = frozenset(
+    {".ARW", ".CR2", ".CR3", ".NEF", ".RAF", ".DNG", ".JPG", ".JPEG", ".TIFF"}
+)
+
+# Variantes pré-calculées des suffixes (sans le point) pour les filtres du
+# parcours scandir. Les fichiers réels sont presque toujours tout en
+# majuscules (ARW, NEF...) ou tout en minuscules (jpg) : tester le suffixe
+# brut contre les deux variantes évite d'allouer une conversion de casse
+# par entrée ; seuls les cas mixtes rares paient le .lower().
+SUPPORTED_SUFFIXES_LOWER = frozenset(
+    s.lstrip(".").lower() for s in ALL_SUPPORTED_FORMATS
+)
+SUPPORTED_SUFFIXES_EXACT = SUPPORTED_SUFFIXES_LOWER | frozenset(
+    s.upper() for s in SUPPORTED_SUFFIXES_LOWER
+)
+
+# Nombre d'entrées gardées dans le cache de dates EXIF : assez pour couvrir
+# plusieurs cartes SD insérées successivement dans la même session.
+EXIF_CACHE_SIZE = 4096
+
+# Arborescence type d'un projet photo : dossier -> sous-dossiers.
+PROJECT_STRUCTURE = {
+    "01_PRE-PRODUCTION": ["Moodboard", "References", "Brief"],
+    "02_RAW": [],
+    "03_SELECTS": [],
+    "04_RETOUCHE": ["PSD", "FINALS"],
+    "05_VIDEO": ["RUSH", "FINALS"],
+    "06_ADMIN": ["Factures", "Contrats"],
+}
+
+# Manifeste caché déposé à la racine d'une source après détection de date :
+# relancer l'outil sur la même carte devient une lecture de JSON au lieu
+# d'un nouveau parcours EXIF complet.
+PHOTOFLOW_MANIFEST_NAME = ".photoflow-meta.json"
+
+# Dossiers systèmes/poubelles jamais descendus pendant les parcours :
+# cartes SD et partages réseau en sont truffés et chaque descente coûte
+# des appels système pour rien.
+EXCLUDED_DIRNAMES = frozenset(
+    {
+        ".Trashes",
+        ".Trash-1000",
+        ".Spotlight-V100",
+        ".fseventsd",
+        ".TemporaryItems",
+        "__MACOSX",
+        ".git",
+        "System Volume Information",
+        "$RECYCLE.BIN",
+        "node_modules",
+    }
+)
@@ -0,0 +1,355 @@
+"""PhotoFlow Master - Lecture des métadonnées EXIF.
+
+Shared EXIF date-detection engine used by the CLI and GUI front-ends.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+import logging
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+
+from PIL import Image
+
+from constants import (
+    EXIF_CACHE_SIZE,
+    SUPPORTED_SUFFIXES_EXACT,
+    SUPPORTED_SUFFIXES_LOWER,
+)
+from file_manager import MAX_WORKERS, scandir_walk
+
+# Les JPEG rangent le bloc EXIF (segment APP1) dans les premiers kilo-octets :
+# lire 64 Kio suffit dans la quasi-totalité des cas et évite de charger le
+# fichier entier juste pour une date.
+_EXIF_HEADER_BYTES = 64 * 1024
+
+# Profondeur de la file de préchargement entre le thread qui liste les
+# dossiers et les workers qui lisent les en-têtes EXIF.
+_PREFETCH_QUEUE_SIZE = 1024
+
+# Arrêt anticipé de find_earliest_date : après autant de dates consécutives
+# collées au minimum courant (reportage d'une seule journée), la probabilité
+# d'en trouver une plus ancienne ne justifie plus le reste du scan.
+_EARLY_EXIT_STREAK = 200
+
+# Identifiants de tags TIFF/EXIF utilisés par le lecteur d'en-tête.
+_TAG_DATETIME_ORIGINAL = 0x9003
+_TAG_EXIF_IFD_POINTER = 0x8769
+
+# Dernier recours pour les formats conteneurs que ni le lecteur d'en-tête ni
+# PIL ne savent ouvrir (CR3 en tête) : exiftool, s'il est installé. Résolu
+# une fois à l'import, pas de which() par fichier.
+_EXIFTOOL = shutil.which("exiftool")
+
+
+class EXIFHandler:
+    """Extrait les dates de prise de vue depuis les métadonnées EXIF."""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        # Cache LRU par instance, clé (st_dev, st_ino, st_mtime_ns) : trois
+        # entiers (~24 octets) au lieu d'une chaîne de chemin, dédoublonnage
+        # gratuit des liens symboliques et des montages multiples, et
+        # invalidation automatique quand le fichier est modifié sur place.
+        self._date_cache = OrderedDict()
+        self._date_cache_lock = threading.Lock()
+
+    def extract_date_taken(self, image_path: Path) -> datetime:
+        """Extract the shooting date from an image's EXIF metadata.
+
+        Results are memoized on the file's (dev, inode, mtime_ns) identity;
+        see _extract_date_uncached for the actual parsing.
+        """
+        path_str = os.fspath(image_path)
+        try:
+            st = os.stat(path_str)
+        except OSError as e:
+            self.logger.error(f"Erreur lors de l'extraction EXIF pour {image_path}: {e}")
+            return None
+
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        with self._date_cache_lock:
+            if key in self._date_cache:
+                self._date_cache.move_to_end(key)
+                return self._date_cache[key]
+
+        date_taken = self._extract_date_uncached(path_str)
+
+        with self._date_cache_lock:
+            self._date_cache[key] = date_taken
+            if len(self._date_cache) > EXIF_CACHE_SIZE:
+                self._date_cache.popitem(last=False)
+        return date_taken
+
+    def _extract_date_uncached(self, image_path: str) -> datetime:
+        """Parse the shooting date from the file.
+
+        Tries a header-only read first (64 KiB, no image decode); PIL is only
+        opened when the fast path cannot locate the date.
+        """
+        try:
+            value = self._fast_datetime_original(image_path)
+            if value:
+                return self._parse_exif_datetime(value)
+        except (OSError, ValueError, IndexError):
+            pass  # En-tête illisible : laisser PIL trancher
+
+        try:
+            with Image.open(image_path) as img:
+                exif_data = img.getexif()
+                if exif_data:
+                    value = exif_data.get(_TAG_DATETIME_ORIGINAL)
+                    if value:
+                        return self._parse_exif_datetime(str(value))
+            # Fichier lisible mais sans DateTimeOriginal (export, capture
+            # d'écran...) : inutile de payer un sous-processus pour rien.
+            return None
+        except Exception as e:
+            pil_error = e
+
+        # PIL n'a pas su ouvrir le fichier (CR3 et autres conteneurs) :
+        # exiftool en dernier recours, s'il est installé.
+        if _EXIFTOOL is not None:
+            value = self._exiftool_datetime_original(image_path)
+            if value:
+                try:
+                    return self._parse_exif_datetime(value)
+                except ValueError:
+                    pass
+        self.logger.error(
+            f"Erreur lors de l'extraction EXIF pour {image_path}: {pil_error}"
+        )
+        return None
+
+    @staticmethod
+    def _exiftool_datetime_original(image_path: str) -> str:
+        """Ask exiftool for DateTimeOriginal, or None on any failure.
+
+        Only reached for files the in-process readers could not parse, so
+        the cost of a subprocess per file stays off the common path.
+        """
+        try:
+            result = subprocess.run(
+                [_EXIFTOOL, "-q", "-S", "-DateTimeOriginal", image_path],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        # Sortie -S : "DateTimeOriginal: 2023:06:12 14:03:21"
+        value = result.stdout.partition(":")[2].strip()
+        return value or None
+
+    @staticmethod
+    def _parse_exif_datetime(value: str) -> datetime:
+        """Parse the fixed 'YYYY:MM:DD HH:MM:SS' EXIF format by slicing.
+
+        datetime.strptime re-walks the format string on every call; direct
+        int() slices are roughly an order of magnitude cheaper on this shape.
+        Certain boîtiers écrivent des variantes (séparateurs exotiques,
+        fractions de seconde) : on retombe alors sur strptime, hors du chemin
+        chaud.
+        """
+        try:
+            if len(value) >= 19:
+                return datetime(
+                    int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                )
+        except ValueError:
+            pass
+        return datetime.strptime(value[:19], "%Y:%m:%d %H:%M:%S")
+
+    def _read_exif_block(self, image_path: str, limit: int = _EXIF_HEADER_BYTES) -> bytes:
+        """Return the raw TIFF/EXIF block from the file header, or None.
+
+        Reads at most `limit` bytes and never touches PIL : ni détection de
+        format, ni décodeur de pixels, juste le bloc de métadonnées.
+        """
+        with open(image_path, "rb") as f:
+            header = f.read(limit)
+        if header[:2] in (b"II", b"MM"):
+            # RAW basés TIFF (ARW, NEF, DNG, CR2, TIFF) : les IFD commencent
+            # directement à l'offset 0, pas besoin de segment APP1
+            return header
+        return self._locate_jpeg_exif_block(header)
+
+    def _fast_datetime_original(self, image_path: str) -> str:
+        """Read DateTimeOriginal from the file header without decoding the image.
+
+        Returns None when the date is not found in the header block, in which
+        case the caller falls back to PIL.
+        """
+        tiff = self._read_exif_block(image_path)
+        if tiff is None:
+            return None
+        return self._tiff_datetime_original(tiff)
+
+    @staticmethod
+    def _locate_jpeg_exif_block(header: bytes) -> bytes:
+        """Return the TIFF payload of the first APP1 Exif segment, if any."""
+        if not header.startswith(b"\xff\xd8"):
+            return None
+        i = 2
+        while i + 4 <= len(header):
+            if header[i] != 0xFF:
+                return None
+            marker = header[i + 1]
+            if marker == 0xDA:  # SOS : les données image commencent, plus d'EXIF
+                return None
+            if 0xD0 <= marker <= 0xD9:  # marqueurs sans segment
+                i += 2
+                continue
+            (seg_len,) = struct.unpack_from(">H", header, i + 2)
+            if marker == 0xE1 and header[i + 4:i + 10] == b"Exif\x00\x00":
+                return header[i + 10:i + 2 + seg_len]
+            i += 2 + seg_len
+        return None
+
+    @staticmethod
+    def _tiff_datetime_original(tiff: bytes) -> str:
+        """Walk IFD0 (and the Exif sub-IFD) of a TIFF block for tag 0x9003."""
+        if tiff[:2] == b"II":
+            fmt = "<"
+        elif tiff[:2] == b"MM":
+            fmt = ">"
+        else:
+            return None
+
+        # Noms chauds liés en locales (LOAD_FAST) : la boucle d'entrées IFD
+        # tourne des dizaines de fois par fichier, sur des milliers de
+        # fichiers par scan.
+        unpack_from = struct.unpack_from
+        tag_date, tag_exif_ifd = _TAG_DATETIME_ORIGINAL, _TAG_EXIF_IFD_POINTER
+
+        def read_ascii(count, value_off):
+            if count <= 4:
+                raw = tiff[value_off:value_off + count]
+            else:
+                (offset,) = unpack_from(fmt + "I", tiff, value_off)
+                raw = tiff[offset:offset + count]
+            return raw.rstrip(b"\x00").decode("ascii", "replace") or None
+
+        def scan_ifd(ifd_offset):
+            (n_entries,) = unpack_from(fmt + "H", tiff, ifd_offset)
+            date, exif_ifd = None, None
+            for i in range(n_entries):
+                entry = ifd_offset + 2 + 12 * i
+                tag, _typ, count = unpack_from(fmt + "HHI", tiff, entry)
+                if tag == tag_date:
+                    date = read_ascii(count, entry + 8)
+                elif tag == tag_exif_ifd:
+                    (exif_ifd,) = unpack_from(fmt + "I", tiff, entry + 8)
+            return date, exif_ifd
+
+        try:
+            (ifd0_offset,) = unpack_from(fmt + "I", tiff, 4)
+            date, exif_ifd = scan_ifd(ifd0_offset)
+            if date is None and exif_ifd is not None:
+                date, _ = scan_ifd(exif_ifd)
+            return date
+        except struct.error:
+            return None  # Bloc EXIF tronqué au-delà de la fenêtre lue
+
+    def _iter_supported_images(self, source_path: Path):
+        """Yield the path (str) of every supported image under source_path.
+
+        Rides the shared scandir_walk and filters on the suffix before any
+        Path object is built.
+        """
+        on_error = lambda directory, e: self.logger.error(
+            f"Dossier illisible pendant le scan : {directory}: {e}"
+        )
+        suffixes_exact = SUPPORTED_SUFFIXES_EXACT
+        suffixes_lower = SUPPORTED_SUFFIXES_LOWER
+        for entry in scandir_walk(source_path, on_error=on_error):
+            suffix = entry.name.rpartition(".")[2]
+            if suffix in suffixes_exact or suffix.lower() in suffixes_lower:
+                yield entry.path
+
+    def _prefetch(self, iterator):
+        """Run iterator on a producer thread, yielding through a bounded queue.
+
+        Le listing des dossiers (scandir) et la lecture des en-têtes EXIF
+        sont deux flux d'E/S distincts ; les faire avancer en parallèle cache
+        la latence de l'un derrière l'autre, surtout sur stockage réseau.
+        """
+        paths = queue.Queue(maxsize=_PREFETCH_QUEUE_SIZE)
+        stop = threading.Event()
+        sentinel = object()
+
+        def producer():
+            try:
+                for item in iterator:
+                    if stop.is_set():
+                        break
+                    paths.put(item)
+            finally:
+                paths.put(sentinel)
+
+        threading.Thread(target=producer, daemon=True).start()
+        try:
+            while (item := paths.get()) is not sentinel:
+                yield item
+        finally:
+            # Arrêt anticipé côté consommateur : débloquer un éventuel put()
+            # en attente pour que le thread producteur se termine proprement.
+            stop.set()
+            while not paths.empty():
+                if paths.get_nowait() is sentinel:
+                    break
+
+    def find_earliest_date(
+        self, source_path: Path, date_callback=None, early_exit_threshold=None
+    ) -> datetime:
+        """Search for the earliest shooting date among the images in source_path.
+
+        EXIF reads are I/O-bound, so files are parsed on a small thread pool;
+        the reduction to the minimum stays on the calling thread, which also
+        receives date_callback notifications for each new earliest date.
+
+        When early_exit_threshold (timedelta) is given, the scan stops once
+        _EARLY_EXIT_STREAK consecutive dates fall within the threshold of the
+        current minimum — on a shoot tenu en une journée, inutile de lire des
+        milliers d'en-têtes aux horodatages quasi identiques.
+        """
+        earliest_date = None
+        streak = 0
+        files = self._prefetch(self._iter_supported_images(source_path))
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            while True:
+                # Soumission par lots : executor.map consommerait tout le
+                # générateur d'un coup, ce qui interdirait l'arrêt anticipé.
+                batch = list(islice(files, MAX_WORKERS * 8))
+                if not batch:
+                    break
+                for file, date_taken in executor.map(self._extract_with_path, batch):
+                    if date_taken is None:
+                        continue
+                    if earliest_date is None or date_taken < earliest_date:
+                        earliest_date = date_taken
+                        streak = 0
+                        if date_callback:
+                            date_callback(Path(file), date_taken)
+                    elif (
+                        early_exit_threshold is not None
+                        and date_taken - earliest_date <= early_exit_threshold
+                    ):
+                        streak += 1
+                    else:
+                        streak = 0
+                if early_exit_threshold is not None and streak >= _EARLY_EXIT_STREAK:
+                    break
+        return earliest_date
+
+    def _extract_with_path(self, image_path: str):
+        """map() helper keeping the path attached to its extracted date."""
+        return image_path, self.extract_date_taken(image_path)
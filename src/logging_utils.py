@@ -0,0 +1,73 @@
+"""PhotoFlow Master - Configuration du journal commun aux interfaces."""
+
+from datetime import datetime
+from pathlib import Path
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter qui mémorise asctime à la seconde près.
+
+    Pendant un lot de copies, des centaines d'enregistrements tombent dans
+    la même seconde : un seul passage par time.strftime suffit pour tous.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_second = None
+        self._last_asctime = None
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_asctime = time.strftime(
+                datefmt or self.default_time_format, self.converter(record.created)
+            )
+        if datefmt is None and self.default_msec_format:
+            # Les millisecondes restent calculées par enregistrement : seul
+            # le strftime de la partie « seconde » est mis en cache.
+            return self.default_msec_format % (self._last_asctime, record.msecs)
+        return self._last_asctime
+
+
+def setup_logging(level=logging.INFO) -> logging.Logger:
+    """Configure (une seule fois) le logger fichier et le renvoie.
+
+    Les producteurs (threads de copie, scan EXIF) ne touchent jamais le
+    disque : ils déposent leurs enregistrements dans une file et un thread
+    dédié les draine vers le fichier, hors du chemin critique.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return root
+
+    log_dir = Path.home() / "Documents" / "PhotoProManager" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / f"manager_{datetime.now().strftime('%Y%m%d')}.log"
+
+    # Les enregistrements n'utilisent ni PID ni nom de thread : inutile de
+    # payer leur collecte à chaque appel, ni de laisser logging lever des
+    # exceptions en plein lot de copies.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.raiseExceptions = False
+
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(_CachedTimeFormatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    return root
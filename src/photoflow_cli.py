@@ -0,0 +1,345 @@
+"""PhotoFlow Master - Interface console.
+
+Front-end Rich au-dessus de PhotoFlowManager.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from datetime import datetime
+import atexit
+import os
+import shutil
+import sys
+import time
+
+from rich.console import Console
+from rich.panel import Panel
+
+from logging_utils import setup_logging
+from validators import sanitize_filename, validate_path
+
+# psutil, rich.prompt, rich.progress et PhotoFlowManager (qui tire PIL) sont
+# importés paresseusement dans les méthodes qui les utilisent : le panneau
+# d'accueil s'affiche ainsi avant de payer leur coût d'import.
+
+# Gabarits des invites de la boucle de saisie, construits une seule fois.
+_SOURCE_PATH_PROMPT = "\n📂 Chemin du dossier source #{} : "
+_PROJECT_NAME_PROMPT = "📝 Nom du projet pour la source {} : "
+
+# Systèmes de fichiers locaux : seuls ceux-là sont interrogés pour l'espace
+# libre. Un statvfs sur un montage réseau périmé (NFS, SMB) peut bloquer
+# plusieurs secondes, précisément au lancement du programme.
+_LOCAL_FSTYPES = frozenset(
+    {"ext2", "ext3", "ext4", "xfs", "btrfs", "f2fs", "zfs",
+     "apfs", "hfs", "hfsplus", "ntfs", "exfat", "vfat", "fat32", "msdos"}
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_user_date(date_str: str) -> datetime:
+    """Parse a 'JJ-MM-AAAA' user date, returning None if invalid.
+
+    Même spécialisation que pour les dates EXIF : le format est connu,
+    des tranches int() remplacent la machinerie générique de strptime,
+    et le constructeur datetime valide les bornes (mois 13, 31 février...).
+    Mémoïsé : une date retapée à l'identique (ou la même date pour
+    plusieurs sources) ne se reparse pas.
+    """
+    if len(date_str) != 10 or date_str[2] != "-" or date_str[5] != "-":
+        return None
+    try:
+        return datetime(int(date_str[6:10]), int(date_str[3:5]), int(date_str[0:2]))
+    except ValueError:
+        return None
+
+
+class PhotoFlowCLI:
+    def __init__(self):
+        self.console = Console()
+        self.setup_logging()
+        self._manager = None
+        # Lignes accumulées par les callbacks chauds (collisions, dates) :
+        # chaque console.print traverse tout le pipeline de rendu Rich, on
+        # ne le paie qu'une fois par source au lieu d'une fois par fichier.
+        self._line_buffer = []
+        # Lancé dès la construction, sur un thread : la liste des disques
+        # (et ses statvfs) se calcule pendant que l'utilisateur tape les
+        # chemins sources, select_drive n'a plus qu'à récupérer le résultat.
+        self._drives_future = ThreadPoolExecutor(max_workers=1).submit(self.list_disks)
+
+    def setup_logging(self):
+        self.logger = setup_logging()
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            from photoflow_manager import PhotoFlowManager
+
+            self._manager = PhotoFlowManager(self.logger)
+        return self._manager
+
+    def _buffer_line(self, line: str):
+        """Queue a markup line for the next _flush_lines call."""
+        self._line_buffer.append(line)
+
+    def _flush_lines(self):
+        """Print the buffered lines in a single Rich render pass."""
+        if self._line_buffer:
+            self.console.print("\n".join(self._line_buffer))
+            self._line_buffer.clear()
+
+    def ask_manual_date(self, source_name: str) -> str:
+        """Ask the user to manually input a date for a specific source.
+
+        L'en-tête coloré passe par Rich une fois ; la boucle de saisie
+        utilise input() brut, chaque Prompt.ask refaisant sinon un passage
+        de rendu complet par tentative.
+        """
+        self.console.print(f"[yellow]Aucune date trouvée pour {source_name}.[/yellow]")
+        while True:
+            date_str = input("Veuillez entrer la date manuellement (format : JJ-MM-AAAA) : ")
+            date_obj = _parse_user_date(date_str)
+            if date_obj is not None:
+                return date_obj.strftime("%Y-%m-%d")
+            self.console.print("[bold red]❌ Format invalide. Veuillez réessayer.[/bold red]")
+
+    def list_disks(self):
+        """List the local drives as (path, free_gb, total_gb) tuples.
+
+        L'espace est mesuré ici, une fois par disque : la boucle d'affichage
+        de select_drive ne refait aucun appel système.
+        """
+        if os.name == "nt":
+            return self._list_disks_windows()
+
+        import psutil
+
+        drives = []
+        for part in psutil.disk_partitions(all=False):
+            if part.fstype.lower() not in _LOCAL_FSTYPES:
+                continue
+            try:
+                # psutil garantit déjà que le point de montage existe ; le
+                # disk_usage sert de vérification, inutile d'ajouter un
+                # exists() (un CreateFileW entier par disque sous Windows).
+                usage = shutil.disk_usage(part.mountpoint)
+            except OSError:
+                continue
+            # part.mountpoint est déjà une chaîne : la transformer en Path
+            # par partition ne servirait qu'à l'affichage, qui la
+            # reconvertirait. Seul le disque choisi devient un Path.
+            drives.append((part.mountpoint, usage.free / 1e9, usage.total / 1e9))
+        return drives
+
+    @staticmethod
+    def _list_disks_windows():
+        """Windows : énumère les lettres de lecteur sans ouvrir de handle.
+
+        GetLogicalDrives renvoie les 26 lettres en un seul appel (masque de
+        bits) et GetDriveTypeW classe chaque lettre sans CreateFileW ; les
+        lecteurs réseau et CD-ROM sont écartés comme les montages réseau
+        le sont côté POSIX.
+        """
+        import ctypes
+
+        DRIVE_REMOVABLE, DRIVE_FIXED = 2, 3
+        kernel32 = ctypes.windll.kernel32
+        bitmask = kernel32.GetLogicalDrives()
+        drives = []
+        for i in range(26):
+            if not bitmask & (1 << i):
+                continue
+            root = f"{chr(65 + i)}:\\"
+            if kernel32.GetDriveTypeW(root) not in (DRIVE_REMOVABLE, DRIVE_FIXED):
+                continue
+            try:
+                usage = shutil.disk_usage(root)
+            except OSError:
+                continue
+            drives.append((root, usage.free / 1e9, usage.total / 1e9))
+        return drives
+
+    def select_drive(self):
+        """Ask the user to select a drive."""
+        from rich.prompt import IntPrompt
+        from rich.table import Table
+
+        drives = self._drives_future.result()
+        # Une table rendue en un seul passage : un console.print par disque
+        # referait tout le pipeline de rendu Rich à chaque ligne.
+        table = Table(title="📁 Disques disponibles", title_style="yellow")
+        table.add_column("", style="cyan", justify="right")
+        table.add_column("Disque")
+        table.add_column("Espace", justify="right")
+        for idx, (drive, free_gb, total_gb) in enumerate(drives, start=1):
+            table.add_row(
+                f"{idx}.", drive, f"{free_gb:.1f} Go libres / {total_gb:.1f} Go"
+            )
+        self.console.print(table)
+
+        choice = IntPrompt.ask(
+            "\n💾 Choisissez le disque où exporter le projet",
+            choices=[str(i) for i in range(1, len(drives) + 1)],
+        )
+        return Path(drives[choice - 1][0])
+
+    def get_source_paths_and_names(self):
+        """Get multiple source folder paths and their project names from the user."""
+        from photoflow_manager import SourceInfo
+
+        # Pendant que l'utilisateur tape le nom du projet, un thread parcourt
+        # la source pour chauffer les caches dentry/page du noyau : la
+        # détection de date démarrera ensuite sur métadonnées déjà en cache.
+        cache_warmer = ThreadPoolExecutor(max_workers=1)
+        sources = []
+        self.console.print("[yellow]Vous pouvez entrer jusqu'à 10 sources.[/yellow]")
+        self.console.print("[cyan]Appuyez sur Entrée sans rien écrire pour terminer.[/cyan]")
+
+        while len(sources) < 10:
+            # Invites purement textuelles : input() brut, Rich est réservé
+            # aux messages où la mise en forme compte.
+            source_path_str = input(_SOURCE_PATH_PROMPT.format(len(sources) + 1))
+            if not source_path_str.strip():
+                break
+
+            source_path = Path(source_path_str)
+            # Un seul stat : exists() puis is_dir() referaient deux fois le
+            # même appel système, sensible sur un montage réseau.
+            if not validate_path(source_path, must_be_dir=True):
+                self.console.print("[bold red]❌ Chemin invalide ou introuvable. Veuillez réessayer.[/bold red]")
+                continue  # Permettre une nouvelle tentative
+
+            cache_warmer.submit(self._warm_source_cache, source_path)
+
+            # Validation avant construction : SourceInfo reste une dataclass
+            # muette, aucun try/except autour de l'instanciation.
+            project_name = input(_PROJECT_NAME_PROMPT.format(source_path)).strip()
+            if not project_name:
+                self.console.print("[bold red]❌ Nom de projet vide. Source ignorée.[/bold red]")
+                continue
+            sources.append(SourceInfo(path=source_path, name=sanitize_filename(project_name)))
+
+        cache_warmer.shutdown(wait=False)
+        if not sources:
+            self.console.print("[bold red]❌ Aucune source valide fournie. Annulation.[/bold red]")
+            exit()
+
+        return sources
+
+    @staticmethod
+    def _warm_source_cache(path):
+        """Walk the source once, only for the kernel cache side effect."""
+        from file_manager import scandir_walk
+
+        try:
+            for _ in scandir_walk(path):
+                pass
+        except OSError:
+            pass
+
+    def detect_dates(self, sources):
+        """Find or ask the date for every source.
+
+        Deux phases strictement séparées : détection automatique d'abord,
+        saisies manuelles ensuite. Aucun affichage vivant (Progress) n'est
+        actif pendant les invites, donc jamais de stop()/start() du rendu
+        Rich entre deux sources. _buffer_line (un append de liste) est sûr
+        depuis les threads ; le flush reste sur le thread principal.
+        """
+        with ThreadPoolExecutor(max_workers=min(8, len(sources))) as executor:
+            for source in sources:
+                executor.submit(
+                    self.manager.detect_date,
+                    source,
+                    date_callback=lambda file, date_taken, source=source: self._buffer_line(
+                        f"[bold green]✅ Date trouvée pour {source.path.name} : {date_taken.strftime('%d-%m-%Y')} (dans {file.name})[/bold green]"
+                    ),
+                )
+        self._flush_lines()
+        for source in sources:
+            if source.date is None:
+                source.date = self.ask_manual_date(source.path.name)
+
+    def process_sources(self, sources, selected_drive: Path):
+        """Create the project structure and copy the files for every source."""
+        from rich.progress import Progress
+
+        for source in sources:
+            with Progress(console=self.console) as progress:
+                task = progress.add_task(
+                    f"Organisation des fichiers depuis {source.path}...", total=None
+                )
+
+                # La barre se redessine au plus 10 fois par seconde : sur un
+                # lot de dizaines de milliers de fichiers, mettre à jour Rich
+                # à chaque copie coûterait plus cher que les copies.
+                last_update = 0.0
+
+                def on_progress(done, total):
+                    nonlocal last_update
+                    now = time.monotonic()
+                    if done == total or now - last_update >= 0.1:
+                        last_update = now
+                        progress.update(task, completed=done, total=total)
+
+                result = self.manager.create_project(
+                    source,
+                    selected_drive,
+                    progress_callback=on_progress,
+                    collision_callback=lambda f, d: self._buffer_line(
+                        f"[yellow]⚠️  Collision détectée : {f.name} renommé en {d.name}[/yellow]"
+                    ),
+                )
+
+            # Hors du contexte Progress : une seule passe de rendu, sans
+            # concurrencer le redessin de la barre.
+            self._flush_lines()
+            if result.skipped_reason:
+                self.console.print(
+                    f"[bold red]❌ {result.skipped_reason}. Source ignorée.[/bold red]"
+                )
+                continue
+
+            self.console.print(f"[bold green]✅ Structure créée : {result.project_path}[/bold green]")
+            for path, message in result.errors:
+                self.console.print(f"[bold red]❌ Erreur lors de la copie de {path.name}: {message}[/bold red]")
+
+    def main(self):
+        self.console.print(
+            Panel(
+                "[bold cyan]📸 Photo Pro Manager[/bold cyan]",
+                subtitle="[italic]Simplifiez vos workflows photo[/italic]",
+            )
+        )
+
+        # Obtenir les chemins source et noms de projets
+        sources = self.get_source_paths_and_names()
+
+        # Trouver ou demander la date pour chaque source
+        self.detect_dates(sources)
+
+        # Sélectionner le disque d'exportation
+        selected_drive = self.select_drive()
+
+        # Créer la structure pour chaque source
+        self.process_sources(sources, selected_drive)
+
+        self.console.print("[bold green]✨ Organisation terminée avec succès ![/bold green]")
+
+
+def main():
+    # Sortie redirigée vers un fichier ou un pipe : bufferisation par blocs
+    # plutôt que ligne à ligne, Rich écrit alors par paquets. Sur un TTY on
+    # ne touche à rien, l'affichage doit rester immédiat.
+    if not sys.stdout.isatty():
+        try:
+            sys.stdout.reconfigure(line_buffering=False, write_through=False)
+        except (AttributeError, OSError):
+            pass
+        atexit.register(sys.stdout.flush)
+    PhotoFlowCLI().main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""PhotoFlow Master - Orchestration des projets.
+
+Coordinates EXIF date detection, project-structure creation and file copies
+on behalf of the front-ends.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import logging
+
+from exif_handler import EXIFHandler
+from file_manager import FileManager
+from validators import validate_path
+
+# Nombre maximal d'erreurs détaillées conservées par projet ; au-delà seul le
+# compteur continue de monter, pour garder la mémoire bornée.
+MAX_RECORDED_ERRORS = 100
+
+
+@dataclass(slots=True)
+class SourceInfo:
+    """Un dossier source et le projet qui en découle."""
+
+    path: Path
+    name: str
+    date: str = None  # ISO AAAA-MM-JJ, None tant que non déterminée
+
+
+@dataclass(slots=True)
+class ProjectResult:
+    """Aggregate outcome of one project creation.
+
+    Per-file outcomes are folded into counters as the copies complete, so
+    memory stays flat even on very large shoots; only the first few errors
+    keep their details for display. slots=True drops the per-instance
+    __dict__ — ces objets existent par lot, autant qu'ils restent compacts.
+    """
+
+    project_path: Path = None
+    files_copied: int = 0
+    files_failed: int = 0
+    files_renamed: int = 0
+    skipped_reason: str = None
+    errors: list = field(default_factory=list)
+
+    def record_error(self, path: Path, message: str):
+        self.files_failed += 1
+        if len(self.errors) < MAX_RECORDED_ERRORS:
+            self.errors.append((path, message))
+
+
+class PhotoFlowManager:
+    """Enchaîne détection de date, création de structure et copie."""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.file_manager = FileManager(self.logger)
+        self.exif_handler = EXIFHandler(self.logger)
+
+    def detect_date(self, source: SourceInfo, date_callback=None) -> bool:
+        """Fill source.date from EXIF metadata; returns False when none found."""
+        date_obj = self.exif_handler.find_earliest_date(source.path, date_callback)
+        if date_obj is None:
+            return False
+        source.date = date_obj.strftime("%Y-%m-%d")
+        return True
+
+    def create_project(self, source: SourceInfo, destination_drive: Path,
+                       progress_callback=None, collision_callback=None,
+                       link_mode="copy") -> ProjectResult:
+        """Create the project for one source and copy its files into 02_RAW."""
+        result = ProjectResult()
+
+        # Une validation par lot ; les copies individuelles font ensuite
+        # confiance au parcours scandir
+        if not validate_path(source.path, must_be_dir=True, check_readable=True):
+            result.skipped_reason = f"Dossier source introuvable ou illisible : {source.path}"
+            self.logger.error(f"Source ignorée : {result.skipped_reason}")
+            return result
+
+        files, total_size = self.file_manager.scan_source(source.path)
+        free_space = self.file_manager.check_disk_space(destination_drive).free
+        if total_size > free_space:
+            result.skipped_reason = (
+                f"Espace insuffisant sur {destination_drive} "
+                f"({total_size / 1e9:.1f} Go requis, {free_space / 1e9:.1f} Go libres)"
+            )
+            self.logger.error(f"Source ignorée : {source.path}: {result.skipped_reason}")
+            return result
+
+        base_path = destination_drive / "PROJETS_PHOTO" / source.date.split("-")[0]
+        base_path.mkdir(parents=True, exist_ok=True)
+        result.project_path = self.file_manager.create_project_structure(
+            base_path, f"{source.date}_{source.name}"
+        )
+
+        def on_collision(src, dst):
+            result.files_renamed += 1
+            if collision_callback:
+                collision_callback(src, dst)
+
+        result.files_copied, _ = self.file_manager.organize_files(
+            source.path,
+            result.project_path,
+            files=files,
+            progress_callback=progress_callback,
+            collision_callback=on_collision,
+            error_callback=lambda path, e: result.record_error(path, str(e)),
+            link_mode=link_mode,
+        )
+        return result
+
+    def process_multiple_sources(self, sources, destination_drive: Path,
+                                 **callbacks):
+        """Yield a ProjectResult per source, aggregating on the fly."""
+        for source in sources:
+            yield source, self.create_project(source, destination_drive, **callbacks)
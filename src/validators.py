@@ -0,0 +1,46 @@
+"""PhotoFlow Master - Validation et nettoyage des entrées utilisateur."""
+
+import os
+import stat as stat_module
+
+# Marge sous la limite de 255 octets des systèmes de fichiers courants,
+# le préfixe date du dossier projet étant ajouté ensuite.
+MAX_FILENAME_LENGTH = 100
+
+REPLACEMENT_CHAR = "_"
+
+# Caractères interdits par Windows/macOS. La table est construite une fois ;
+# str.translate est nettement plus rapide que le moteur regex pour une
+# simple substitution caractère à caractère.
+_SANITIZE_TABLE = str.maketrans({c: REPLACEMENT_CHAR for c in '<>:"/\\|?*'})
+
+
+def sanitize_filename(name: str, max_length: int = MAX_FILENAME_LENGTH) -> str:
+    """Sanitize a project or file name to avoid OS conflicts.
+
+    Les points et espaces de tête/queue sont retirés (Windows les refuse) et
+    un nom entièrement invalide retombe sur « sans_nom ».
+    """
+    cleaned = name.translate(_SANITIZE_TABLE).strip(". ")
+    return (cleaned or "sans_nom")[:max_length]
+
+
+def validate_path(path, must_be_dir=False, check_readable=False) -> bool:
+    """Validate a user-supplied path once, at the batch boundary.
+
+    À appeler sur les chemins saisis par l'utilisateur uniquement : les
+    fichiers issus du parcours scandir ont déjà été classés par le noyau
+    pendant la lecture du dossier, les revalider un à un ne ferait que
+    répéter les mêmes appels système.
+    """
+    # Un seul os.stat : exists/is_dir séparés referaient chacun le même
+    # appel système, et resolve() en ajouterait un par composant du chemin.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if must_be_dir and not stat_module.S_ISDIR(st.st_mode):
+        return False
+    if check_readable and not os.access(path, os.R_OK):
+        return False
+    return True
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from exif_handler import EXIFHandler
+
+DATETIME_ORIGINAL = 0x9003
+
+
+def write_jpeg(path, date_str=None):
+    img = Image.new("RGB", (4, 4))
+    if date_str is None:
+        img.save(path)
+        return
+    exif = img.getexif()
+    exif[DATETIME_ORIGINAL] = date_str
+    img.save(path, exif=exif)
+
+
+@pytest.fixture
+def handler():
+    return EXIFHandler()
+
+
+def test_extract_date_taken(tmp_path, handler):
+    write_jpeg(tmp_path / "IMG_0001.jpg", "2023:06:15 10:30:00")
+    assert handler.extract_date_taken(tmp_path / "IMG_0001.jpg") == datetime(2023, 6, 15, 10, 30)
+
+
+def test_extract_date_taken_without_exif(tmp_path, handler):
+    write_jpeg(tmp_path / "IMG_0001.jpg")
+    assert handler.extract_date_taken(tmp_path / "IMG_0001.jpg") is None
+
+
+def test_dateless_image_does_not_invoke_exiftool(tmp_path, handler, monkeypatch):
+    import exif_handler as eh
+
+    write_jpeg(tmp_path / "IMG_0001.jpg")
+    monkeypatch.setattr(eh, "_EXIFTOOL", "/usr/bin/exiftool")
+    monkeypatch.setattr(
+        eh.EXIFHandler,
+        "_exiftool_datetime_original",
+        staticmethod(lambda path: pytest.fail("exiftool invoqué pour un JPEG lisible")),
+    )
+
+    # JPEG valide mais sans date : pas de sous-processus, juste None
+    assert handler.extract_date_taken(tmp_path / "IMG_0001.jpg") is None
+
+
+def test_extract_date_taken_is_cached_until_file_changes(tmp_path, handler):
+    import os
+
+    path = tmp_path / "IMG_0001.jpg"
+    write_jpeg(path, "2023:06:15 10:30:00")
+    st = path.stat()
+    assert handler.extract_date_taken(path) == datetime(2023, 6, 15, 10, 30)
+
+    # Même (dev, inode, mtime_ns) : le cache répond sans relire le fichier
+    path.write_bytes(b"pas un jpeg")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert handler.extract_date_taken(path) == datetime(2023, 6, 15, 10, 30)
+
+    # mtime modifié : l'entrée est invalidée et la relecture échoue
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert handler.extract_date_taken(path) is None
+
+
+def test_find_earliest_date(tmp_path, handler):
+    write_jpeg(tmp_path / "IMG_0001.jpg", "2023:06:15 10:30:00")
+    write_jpeg(tmp_path / "IMG_0002.jpg", "2023:06:12 08:00:00")
+    (tmp_path / "notes.txt").write_text("pas une image")
+
+    assert handler.find_earliest_date(tmp_path) == datetime(2023, 6, 12, 8, 0)
+
+
+def test_find_earliest_date_scans_subfolders_but_not_excluded_dirs(tmp_path, handler):
+    (tmp_path / "DCIM").mkdir()
+    write_jpeg(tmp_path / "DCIM" / "IMG_0001.jpg", "2023:06:15 10:30:00")
+    (tmp_path / ".Trashes").mkdir()
+    write_jpeg(tmp_path / ".Trashes" / "IMG_0000.jpg", "2020:01:01 00:00:00")
+
+    assert handler.find_earliest_date(tmp_path) == datetime(2023, 6, 15, 10, 30)
+
+
+def test_fast_path_reads_jpeg_app1(tmp_path, handler):
+    write_jpeg(tmp_path / "IMG_0001.jpg", "2022:01:02 03:04:05")
+
+    # Le chemin rapide lit la date dans le segment APP1 sans ouvrir PIL
+    assert handler._fast_datetime_original(
+        tmp_path / "IMG_0001.jpg"
+    ) == "2022:01:02 03:04:05"
+
+
+def test_fast_path_reads_tiff_based_raw(tmp_path, handler):
+    img = Image.new("RGB", (4, 4))
+    exif = img.getexif()
+    exif[DATETIME_ORIGINAL] = "2022:01:02 03:04:05"
+    img.save(tmp_path / "IMG_0001.tiff", exif=exif)
+
+    assert handler._fast_datetime_original(tmp_path / "IMG_0001.tiff") == "2022:01:02 03:04:05"
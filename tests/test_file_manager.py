@@ -0,0 +1,222 @@
+import os
+
+import pytest
+
+from file_manager import FileManager, scandir_walk
+
+
+@pytest.fixture
+def manager():
+    return FileManager()
+
+
+def test_organize_files_copies_content_and_mtime(tmp_path, manager):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"raw data" * 1000)
+    os.utime(source / "IMG_0001.ARW", (1_600_000_000, 1_600_000_000))
+
+    project = tmp_path / "projet"
+    copied, total = manager.organize_files(source, project)
+
+    destination = project / "02_RAW" / "IMG_0001.ARW"
+    assert (copied, total) == (1, 1)
+    assert destination.read_bytes() == b"raw data" * 1000
+    assert int(destination.stat().st_mtime) == 1_600_000_000
+
+
+def test_organize_files_renames_on_collision(tmp_path, manager):
+    source = tmp_path / "source"
+    (source / "a").mkdir(parents=True)
+    (source / "b").mkdir()
+    (source / "a" / "IMG_0001.ARW").write_bytes(b"premiere")
+    (source / "b" / "IMG_0001.ARW").write_bytes(b"seconde")
+
+    project = tmp_path / "projet"
+    copied, total = manager.organize_files(source, project)
+
+    raw = project / "02_RAW"
+    assert (copied, total) == (2, 2)
+    assert {f.name for f in raw.iterdir()} == {"IMG_0001.ARW", "IMG_0001_1.ARW"}
+    assert {f.read_bytes() for f in raw.iterdir()} == {b"premiere", b"seconde"}
+
+
+def test_collision_counters_seeded_from_existing_destination(tmp_path, manager):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"nouvelle")
+
+    # Reliquat d'un lot précédent : IMG_0001.ARW et IMG_0001_1.ARW existent déjà
+    raw = tmp_path / "projet" / "02_RAW"
+    raw.mkdir(parents=True)
+    (raw / "IMG_0001.ARW").write_bytes(b"ancienne")
+    (raw / "IMG_0001_1.ARW").write_bytes(b"ancienne bis")
+
+    copied, total = manager.organize_files(source, tmp_path / "projet")
+
+    assert (copied, total) == (1, 1)
+    assert (raw / "IMG_0001_2.ARW").read_bytes() == b"nouvelle"
+    assert (raw / "IMG_0001.ARW").read_bytes() == b"ancienne"
+
+
+def test_create_project_structure(tmp_path, manager):
+    project = manager.create_project_structure(tmp_path, "2023-06-12_Mariage")
+
+    assert project == tmp_path / "2023-06-12_Mariage"
+    assert (project / "01_PRE-PRODUCTION" / "Moodboard").is_dir()
+    assert (project / "02_RAW").is_dir()
+    assert (project / "06_ADMIN" / "Contrats").is_dir()
+
+
+def test_organize_files_hardlink_mode(tmp_path, manager):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"raw")
+
+    project = tmp_path / "projet"
+    copied, total = manager.organize_files(source, project, link_mode="hardlink")
+
+    destination = project / "02_RAW" / "IMG_0001.ARW"
+    assert (copied, total) == (1, 1)
+    assert destination.stat().st_ino == (source / "IMG_0001.ARW").stat().st_ino
+
+
+def test_copy_file_keeps_content_and_times(tmp_path, manager):
+    source = tmp_path / "IMG_0001.ARW"
+    source.write_bytes(b"raw data" * 4096)
+    os.utime(source, (1_600_000_000, 1_600_000_000))
+
+    destination = tmp_path / "copie" / "IMG_0001.ARW"
+    destination.parent.mkdir()
+    manager.copy_file(source, destination)
+
+    # Quel que soit le chemin pris (reflink, copy_file_range, sendfile ou
+    # boucle en espace utilisateur), contenu et horodatage sont identiques
+    assert destination.read_bytes() == source.read_bytes()
+    assert int(destination.stat().st_mtime) == 1_600_000_000
+
+
+def test_copy_file_preserves_mode_bits(tmp_path, manager):
+    source = tmp_path / "IMG_0001.ARW"
+    source.write_bytes(b"raw")
+    os.chmod(source, 0o640)
+
+    destination = tmp_path / "copie.ARW"
+    manager.copy_file(source, destination)
+
+    assert os.stat(destination).st_mode & 0o777 == 0o640
+
+
+def test_organize_files_move_mode(tmp_path, manager):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"raw")
+
+    project = tmp_path / "projet"
+    copied, total = manager.organize_files(source, project, link_mode="move")
+
+    assert (copied, total) == (1, 1)
+    assert (project / "02_RAW" / "IMG_0001.ARW").read_bytes() == b"raw"
+    assert not (source / "IMG_0001.ARW").exists()
+
+
+def test_calculate_checksum(tmp_path, manager):
+    source = tmp_path / "IMG_0001.ARW"
+    source.write_bytes(b"raw data" * 4096)
+
+    import hashlib
+
+    expected = hashlib.sha256(b"raw data" * 4096).hexdigest()
+    assert manager.calculate_checksum(source) == expected
+
+
+def test_calculate_checksum_crc32(tmp_path, manager):
+    import zlib
+
+    source = tmp_path / "IMG_0001.ARW"
+    source.write_bytes(b"raw data" * 4096)
+
+    expected = f"{zlib.crc32(b'raw data' * 4096):08x}"
+    assert manager.calculate_checksum(source, algorithm="crc32") == expected
+
+
+def test_copy_file_verified_returns_source_digest(tmp_path, manager):
+    source = tmp_path / "IMG_0001.ARW"
+    source.write_bytes(b"raw data" * 4096)
+    destination = tmp_path / "copie.ARW"
+
+    digest = manager.copy_file_verified(source, destination)
+
+    assert destination.read_bytes() == source.read_bytes()
+    assert digest == manager.calculate_checksum(source)
+
+
+def test_files_identical(tmp_path, manager):
+    a = tmp_path / "a.ARW"
+    b = tmp_path / "b.ARW"
+    c = tmp_path / "c.ARW"
+    a.write_bytes(b"raw data" * 4096)
+    b.write_bytes(b"raw data" * 4096)
+    c.write_bytes(b"raw data" * 4095 + b"raw dat!")
+
+    d = tmp_path / "d.ARW"
+    d.write_bytes(b"raw")
+
+    assert manager.files_identical(a, b)
+    assert not manager.files_identical(a, c)  # même taille, contenu différent
+    assert not manager.files_identical(a, d)  # écarté sur la taille seule
+
+
+def test_scandir_walk_yields_files_only(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "IMG_0001.ARW").write_bytes(b"x")
+    (tmp_path / "sub" / "IMG_0002.ARW").write_bytes(b"x")
+    (tmp_path / "$RECYCLE.BIN").mkdir()
+    (tmp_path / "$RECYCLE.BIN" / "IMG_9999.ARW").write_bytes(b"x")
+
+    entries = list(scandir_walk(tmp_path))
+
+    # Que des DirEntry de fichiers (type déjà connu, pas de stat à refaire),
+    # les dossiers poubelles élagués
+    assert {e.name for e in entries} == {"IMG_0001.ARW", "IMG_0002.ARW"}
+    assert all(e.is_file(follow_symlinks=False) for e in entries)
+
+
+def test_scan_source_returns_paths_and_total_size(tmp_path, manager):
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "IMG_0001.ARW").write_bytes(b"x" * 100)
+    (source / "sub" / "IMG_0002.ARW").write_bytes(b"x" * 50)
+
+    paths, total_size = manager.scan_source(source)
+
+    assert sorted(os.path.basename(p) for p in paths) == ["IMG_0001.ARW", "IMG_0002.ARW"]
+    assert total_size == 150
+
+
+def test_create_archive_stores_raw_and_deflates_text(tmp_path, manager):
+    import zipfile
+
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"raw" * 100)
+    (source / "notes.txt").write_text("x" * 1000)
+
+    archive = tmp_path / "backup.zip"
+    count = manager.create_archive(source, archive)
+
+    assert count == 2
+    with zipfile.ZipFile(archive) as zf:
+        by_name = {info.filename: info for info in zf.infolist()}
+        assert by_name["IMG_0001.ARW"].compress_type == zipfile.ZIP_STORED
+        assert by_name["notes.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("IMG_0001.ARW") == b"raw" * 100
+
+
+def test_get_directory_stats(tmp_path, manager):
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "IMG_0001.ARW").write_bytes(b"x" * 100)
+    (source / "sub" / "IMG_0002.ARW").write_bytes(b"x" * 50)
+
+    assert manager.get_directory_stats(source) == (2, 150)
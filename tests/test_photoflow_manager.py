@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from photoflow_manager import PhotoFlowManager, SourceInfo
+
+
+def test_create_project_copies_and_counts(tmp_path):
+    source = tmp_path / "carte_sd"
+    source.mkdir()
+    (source / "IMG_0001.ARW").write_bytes(b"raw")
+    (source / "IMG_0002.ARW").write_bytes(b"raw")
+
+    drive = tmp_path / "disque"
+    drive.mkdir()
+
+    manager = PhotoFlowManager()
+    info = SourceInfo(path=source, name="Mariage", date="2023-06-12")
+    result = manager.create_project(info, drive)
+
+    assert result.skipped_reason is None
+    assert result.project_path == drive / "PROJETS_PHOTO" / "2023" / "2023-06-12_Mariage"
+    assert result.files_copied == 2
+    assert result.files_failed == 0
+    assert result.files_renamed == 0
+    assert (result.project_path / "02_RAW" / "IMG_0001.ARW").is_file()
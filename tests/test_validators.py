@@ -0,0 +1,21 @@
+from validators import MAX_FILENAME_LENGTH, sanitize_filename
+
+
+def test_sanitize_filename_replaces_invalid_chars():
+    assert sanitize_filename('Mariage: Juin/2023 <final>') == 'Mariage_ Juin_2023 _final_'
+
+
+def test_sanitize_filename_keeps_valid_names():
+    assert sanitize_filename('2023-06-12_Mariage') == '2023-06-12_Mariage'
+
+
+def test_sanitize_filename_truncates():
+    assert len(sanitize_filename('x' * 500)) == MAX_FILENAME_LENGTH
+
+
+def test_sanitize_filename_strips_trailing_dots_and_spaces():
+    assert sanitize_filename('  Mariage. ') == 'Mariage'
+
+
+def test_sanitize_filename_empty_falls_back():
+    assert sanitize_filename('...') == 'sans_nom'